@@ -1,38 +1,83 @@
 """
-Flask Web App demonstrating:
+Quart (Flask-compatible ASGI) Web App demonstrating:
   1) Object-Oriented Programming (OOP)
-  2) Functional Programming (map, filter)
+  2) Functional style (comprehensions, pure vectorised price functions)
   3) Asynchronous I/O with asyncio (async routes + concurrent tasks)
   4) HTML frontend for interaction with live item table
 
-Run locally:
-  pip install Flask>=2.2
-  python app.py
+Run locally (reloading development server):
+  pip install -r requirements.txt
+  DEBUG=1 python app.py
 Then open http://127.0.0.1:5000
+
+In production the app runs under Gunicorn with Uvicorn workers (see
+Procfile and gunicorn.conf.py), so async routes share each worker's event
+loop instead of one loop per request.
+The front page is static/index.html; behind a reverse proxy, serve ``/``
+and ``/static/`` from that directory directly and forward only ``/items*``
+and ``/async/*`` to the app.
 """
 from __future__ import annotations
 
 import asyncio
+import bisect
+import os
 import random
-from dataclasses import dataclass, field, asdict
-from itertools import count
+import threading
+from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import List, Iterable, Dict, Any
 
-from flask import Flask, jsonify, request, render_template_string
+import numpy as np
+import orjson
+from async_lru import alru_cache
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
+from quart import Quart, Response, request
 
-app = Flask(__name__)
+app = Quart(__name__)
+app.config["SEND_FILE_MAX_AGE_DEFAULT"] = 3600
+# Match "/items/" as "/items" directly instead of answering with a redirect.
+# Must be set before the routes below are registered.
+app.url_map.strict_slashes = False
 
 # -----------------------------
 # OOP: Domain Model
 # -----------------------------
-_id_seq = count(1)
+class IdAllocator:
+    """Lock-guarded id sequence.
+
+    ``itertools.count`` only hands out unique ids thanks to the GIL; this stays
+    correct on free-threaded builds, and ``allocate(k)`` reserves a whole batch
+    under a single lock acquisition.
+    """
+
+    def __init__(self, start: int = 1) -> None:
+        self._lock = threading.Lock()
+        self._next = start
+
+    def allocate(self, k: int = 1) -> range:
+        with self._lock:
+            first = self._next
+            self._next += k
+        return range(first, first + k)
 
-@dataclass
+    def reserve(self, item_id: int) -> None:
+        """Make sure ``item_id`` is never handed out by a later ``allocate``."""
+        with self._lock:
+            if item_id >= self._next:
+                self._next = item_id + 1
+
+
+@dataclass(slots=True)
 class Item:
     name: str
     price: float
     category: str
-    id: int = field(default_factory=lambda: next(_id_seq))
+    id: int = 0  # 0 = not yet assigned; Inventory.add() allocates one
+    category_lower: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.category_lower = self.category.lower()
 
     def apply_discount(self, percent: float) -> float:
         percent = max(0.0, min(percent, 100.0))
@@ -40,25 +85,162 @@ class Item:
         return discounted
 
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        return {"id": self.id, "name": self.name, "price": self.price, "category": self.category}
+
+
+class ItemIn(BaseModel):
+    """POST /items payload, validated by pydantic-core."""
+
+    model_config = ConfigDict(str_strip_whitespace=True, str_min_length=1, allow_inf_nan=False)
+
+    name: str
+    price: float = Field(gt=0)
+    category: str
 
 
 class Inventory:
-    def __init__(self, items: Iterable[Item] | None = None) -> None:
-        self._items: List[Item] = list(items) if items else []
+    """Columnar (struct-of-arrays) item store.
+
+    Each field lives in its own pre-allocated NumPy array so queries are
+    vectorised masks over contiguous columns instead of per-item attribute
+    access. Arrays grow geometrically; only the first ``_len`` rows are live.
+    """
+
+    _INITIAL_CAPACITY = 16
+
+    def __init__(self, items: Iterable[Item] | None = None, ids: IdAllocator | None = None) -> None:
+        self._id_alloc = ids or IdAllocator()
+        self._len = 0
+        self._version = 0
+        self._json_cache: tuple[int, bytes] | None = None
+        self._expensive_json_cached = lru_cache(maxsize=128)(self._expensive_json)
+        # (price, row) pairs kept sorted so price-threshold queries are a bisect.
+        self._by_price: list[tuple[float, int]] = []
+        # Prebuilt JSON-ready dict per row, appended once on insert.
+        self._dicts: list[Dict[str, Any]] = []
+        self._alloc(self._INITIAL_CAPACITY)
+        if items:
+            self.extend(items)
+
+    def _alloc(self, capacity: int) -> None:
+        self._ids = np.zeros(capacity, dtype=np.int64)
+        self._names = np.empty(capacity, dtype=object)
+        self._prices = np.zeros(capacity, dtype=np.float64)
+        self._categories = np.empty(capacity, dtype=object)
+        self._cats_lower = np.empty(capacity, dtype=object)
+
+    def _grow(self) -> None:
+        old = (self._ids, self._names, self._prices, self._categories, self._cats_lower)
+        self._alloc(len(self._ids) * 2)
+        for dst, src in zip((self._ids, self._names, self._prices, self._categories, self._cats_lower), old):
+            dst[: self._len] = src[: self._len]
+
+    def __len__(self) -> int:
+        return self._len
 
     def add(self, item: Item) -> Item:
-        self._items.append(item)
+        if item.id:
+            self._id_alloc.reserve(item.id)
+        else:
+            item.id = self._id_alloc.allocate()[0]
+        self._append(item)
         return item
 
+    def extend(self, items: Iterable[Item]) -> List[Item]:
+        items = list(items)
+        unassigned = [i for i in items if not i.id]
+        if len(unassigned) < len(items):
+            self._id_alloc.reserve(max(i.id for i in items))
+        for item, item_id in zip(unassigned, self._id_alloc.allocate(len(unassigned))):
+            item.id = item_id
+        for item in items:
+            self._append(item)
+        return items
+
+    def _append(self, item: Item) -> None:
+        if self._len == len(self._ids):
+            self._grow()
+        n = self._len
+        self._ids[n] = item.id
+        self._names[n] = item.name
+        self._prices[n] = item.price
+        self._categories[n] = item.category
+        self._cats_lower[n] = item.category_lower
+        bisect.insort(self._by_price, (item.price, n))
+        self._dicts.append(item.to_dict())
+        self._len = n + 1
+        self._version += 1
+
+    def _gather(self, idx: np.ndarray | slice) -> List[Item]:
+        return [
+            Item(name, price, category, id=item_id)
+            for item_id, name, price, category in zip(
+                self._ids[idx].tolist(),
+                self._names[idx].tolist(),
+                self._prices[idx].tolist(),
+                self._categories[idx].tolist(),
+            )
+        ]
+
     def all(self) -> List[Item]:
-        return list(self._items)
+        return self._gather(slice(0, self._len))
+
+    def columns(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Live ``(ids, prices, lowered categories)`` views, aligned row for row."""
+        n = self._len
+        return self._ids[:n], self._prices[:n], self._cats_lower[:n]
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """Row dicts in insertion order. The dicts are shared; don't mutate them."""
+        return list(self._dicts)
+
+    def to_json(self) -> bytes:
+        """Serialized ``to_dicts()``, rebuilt only after the inventory changes."""
+        cached = self._json_cache
+        if cached is None or cached[0] != self._version:
+            cached = self._json_cache = (self._version, orjson.dumps(self._dicts))
+        return cached[1]
+
+    def expensive_json(self, min_price: float) -> bytes:
+        if min_price != min_price:
+            # NaN matches nothing, and as a key it never equals itself, so
+            # every NaN request would add a fresh entry to the LRU cache.
+            return b"[]"
+        return self._expensive_json_cached(self._version, min_price)
+
+    def _expensive_json(self, version: int, min_price: float) -> bytes:
+        # ``version`` is only part of the cache key so adds invalidate old entries.
+        dicts = self._dicts
+        return orjson.dumps([dicts[row] for row in self._expensive_rows(min_price).tolist()])
+
+    def search_dicts(self, *, min_price: float | None = None, category: str | None = None) -> List[Dict[str, Any]]:
+        dicts = self._dicts
+        return [dicts[row] for row in self._search_rows(min_price, category).tolist()]
+
+    def _search_rows(self, min_price: float | None, category: str | None) -> np.ndarray:
+        n = self._len
+        mask = np.ones(n, dtype=bool)
+        if min_price is not None:
+            mask &= self._prices[:n] >= min_price
+        if category is not None:
+            mask &= self._cats_lower[:n] == category.lower()
+        return np.flatnonzero(mask)
 
     def by_category(self, category: str) -> List[Item]:
-        return [i for i in self._items if i.category.lower() == category.lower()]
+        return self._gather(np.flatnonzero(self._cats_lower[: self._len] == category.lower()))
 
     def expensive(self, min_price: float) -> List[Item]:
-        return [i for i in self._items if i.price >= min_price]
+        return self._gather(self._expensive_rows(min_price))
+
+    def _expensive_rows(self, min_price: float) -> np.ndarray:
+        if min_price != min_price:
+            # NaN: ``price >= nan`` never holds, but bisect would place it first.
+            return np.empty(0, dtype=np.intp)
+        start = bisect.bisect_left(self._by_price, (min_price,))
+        rows = np.fromiter((row for _, row in self._by_price[start:]), dtype=np.intp)
+        # Sort the matching rows so results keep insertion order, as before.
+        rows.sort()
+        return rows
 
 
 # Seed data
@@ -73,225 +255,185 @@ inventory = Inventory(
 )
 
 # -----------------------------
-# Functional Programming helpers
+# AsyncIO: Simulated external calls
 # -----------------------------
-
-def items_to_dicts(items: Iterable[Item]) -> List[Dict[str, Any]]:
-    return list(map(lambda i: i.to_dict(), items))
-
-
-def filter_items(items: Iterable[Item], *, min_price: float | None = None, category: str | None = None) -> List[Item]:
-    preds = []
-    if min_price is not None:
-        preds.append(lambda i: i.price >= float(min_price))
-    if category is not None:
-        preds.append(lambda i: i.category.lower() == category.lower())
-
-    if not preds:
-        return list(items)
-
-    def all_preds(i: Item) -> bool:
-        return all(p(i) for p in preds)
-
-    return list(filter(all_preds, items))
+# FAST_MODE=1 swaps the simulated network calls for deterministic, sleep-free
+# lookups (tests, demos): no PRNG, no timers, no event-loop round-trips.
+FAST = os.environ.get("FAST_MODE") == "1"
+
+TAX_TABLE = {
+    "electronics": 0.13,
+    "furniture": 0.08,
+    "stationery": 0.05,
+}
+DEFAULT_TAX_RATE = 0.07
+
+
+def static_tax_rate(category: str) -> float:
+    return TAX_TABLE.get(category.lower(), DEFAULT_TAX_RATE)
+
+
+def static_discount(item_id: int) -> float:
+    # Multiplicative hash of the id spread over 0.00-15.00, matching the live range.
+    return (item_id * 2654435761 % 1501) / 100
+
+
+if FAST:
+    async def fetch_tax_rate(category: str) -> float:
+        return static_tax_rate(category)
+
+    async def fetch_dynamic_discount(item_id: int) -> float:
+        return static_discount(item_id)
+
+else:
+    async def fetch_tax_rate(category: str) -> float:
+        # Normalize before the cache lookup so "Furniture" and "furniture" share an entry.
+        return await _fetch_tax_rate(category.lower())
+
+    @alru_cache(maxsize=64, ttl=300)
+    async def _fetch_tax_rate(category: str) -> float:
+        await asyncio.sleep(random.uniform(0.1, 0.4))
+        return TAX_TABLE.get(category, DEFAULT_TAX_RATE)
+
+    async def fetch_dynamic_discount(item_id: int) -> float:
+        await asyncio.sleep(random.uniform(0.1, 0.5))
+        return round(random.uniform(0, 15), 2)
+
+
+def compute_adjusted_prices(
+    prices: np.ndarray, tax_rates: np.ndarray, discounts: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """Vectorised ``(taxed, final)`` prices for aligned price/tax/discount arrays."""
+    if _adjust is not None:
+        taxed = np.empty_like(prices)
+        final = np.empty_like(prices)
+        _adjust(prices, tax_rates, discounts, taxed, final)
+        return taxed, final
+    growth = 1.0 + tax_rates
+    taxed = np.round(prices * growth, 2)
+    final = np.round(prices * (1.0 - np.clip(discounts, 0.0, 100.0) / 100.0) * growth, 2)
+    return taxed, final
+
+
+# Numba fuses the multiply/round chain above into one pass over the rows
+# instead of materialising a NumPy temporary per step. Optional: without numba
+# installed the NumPy expressions are used. Deliberately not parallel=True:
+# inventories are small, and a thread pool started at import would be
+# inherited across gunicorn's fork (preload_app), which GNU OpenMP can't survive.
+try:
+    from numba import njit
+except ImportError:  # pragma: no cover
+    _adjust = None
+else:
+    # fastmath minus "arcp": turning the /100 into *0.01 would break the rounding.
+    @njit(fastmath={"nnan", "ninf", "nsz", "contract"})
+    def _adjust(prices, tax_rates, discounts, taxed, final):
+        for i in range(prices.size):
+            growth = 1.0 + tax_rates[i]
+            disc = min(max(discounts[i], 0.0), 100.0)
+            taxed[i] = np.rint(prices[i] * growth * 100.0) / 100.0
+            final[i] = np.rint(prices[i] * (1.0 - disc / 100.0) * growth * 100.0) / 100.0
+
+    # Compile at import so the first /async/quotes request doesn't pay for it.
+    compute_adjusted_prices(np.ones(1), np.zeros(1), np.zeros(1))
 
 
 # -----------------------------
-# AsyncIO: Simulated external calls
+# Routes
 # -----------------------------
-async def fetch_tax_rate(category: str) -> float:
-    await asyncio.sleep(random.uniform(0.1, 0.4))
-    base = {
-        "electronics": 0.13,
-        "furniture": 0.08,
-        "stationery": 0.05,
-    }.get(category.lower(), 0.07)
-    return base
-
-
-async def fetch_dynamic_discount(item_id: int) -> float:
-    await asyncio.sleep(random.uniform(0.1, 0.5))
-    return round(random.uniform(0, 15), 2)
-
-
-async def compute_adjusted_price(item: Item) -> Dict[str, Any]:
-    tax_rate, discount_pct = await asyncio.gather(
-        fetch_tax_rate(item.category),
-        fetch_dynamic_discount(item.id),
-    )
-    taxed = round(item.price * (1 + tax_rate), 2)
-    final_price = round(item.apply_discount(discount_pct) * (1 + tax_rate), 2)
-    return {
-        "item": item.to_dict(),
-        "tax_rate": tax_rate,
-        "discount_percent": discount_pct,
-        "taxed_price": taxed,
-        "final_price": final_price,
-    }
+def _json(obj: Any) -> Response:
+    return _json_bytes(orjson.dumps(obj))
 
 
-# -----------------------------
-# HTML Template
-# -----------------------------
-INDEX_TEMPLATE = """
-<!doctype html>
-<html>
-  <head>
-    <meta charset="utf-8" />
-    <meta name="viewport" content="width=device-width, initial-scale=1" />
-    <title>Flask: OOP + FP + asyncio</title>
-    <style>
-      body{font-family: system-ui, -apple-system, Segoe UI, Roboto, Ubuntu, Cantarell, Noto Sans, Arial, sans-serif; margin: 2rem; background:#f9fafb;}
-      h1{color:#1f2937;}
-      .card{border:1px solid #e5e7eb;border-radius:12px;padding:1rem;margin:1rem 0;background:white;box-shadow:0 2px 5px rgba(0,0,0,0.05)}
-      .grid{display:grid;grid-template-columns:repeat(auto-fit,minmax(260px,1fr));gap:1rem}
-      a.button{display:inline-block;padding:.5rem .75rem;border:1px solid #3b82f6;border-radius:8px;text-decoration:none;color:#3b82f6;font-weight:600}
-      a.button:hover{background:#3b82f6;color:white}
-      pre{background:#f3f4f6;padding:.5rem;border-radius:6px;}
-      form input{padding:.4rem;margin:.3rem;border-radius:6px;border:1px solid #d1d5db;}
-      form button{padding:.5rem 1rem;border:none;border-radius:8px;background:#3b82f6;color:white;cursor:pointer}
-      form button:hover{background:#2563eb}
-      table{width:100%;border-collapse:collapse;margin-top:1rem;}
-      th,td{padding:.5rem;text-align:left;border-bottom:1px solid #e5e7eb;}
-      th{background:#f3f4f6;}
-    </style>
-  </head>
-  <body>
-    <h1>Flask Demo: <em>OOP</em> + <em>Functional</em> + <em>asyncio</em></h1>
-    <p>This mini app demonstrates:</p>
-    <ul>
-      <li><strong>OOP</strong>: <code>Item</code> and <code>Inventory</code> classes encapsulate data & behavior.</li>
-      <li><strong>Functional programming</strong>: <code>map</code>/<code>filter</code> to transform and select items.</li>
-      <li><strong>asyncio</strong>: async route computes adjusted prices via <code>asyncio.gather</code>.</li>
-    </ul>
-
-    <div class="grid">
-      <div class="card">
-        <h3>All items (JSON)</h3>
-        <a class="button" href="/items">GET /items</a>
-      </div>
-      <div class="card">
-        <h3>Filter by price ≥ 100</h3>
-        <a class="button" href="/items/expensive?min=100">GET /items/expensive?min=100</a>
-      </div>
-      <div class="card">
-        <h3>Filter by category=furniture</h3>
-        <a class="button" href="/items/search?category=furniture">GET /items/search?category=furniture</a>
-      </div>
-      <div class="card">
-        <h3>Async adjusted prices</h3>
-        <a class="button" href="/async/quotes">GET /async/quotes</a>
-      </div>
-    </div>
-
-    <div class="card">
-      <h3>Create an Item</h3>
-      <form method="POST" action="/items" onsubmit="submitForm(event)">
-        <input type="text" name="name" placeholder="Name" required>
-        <input type="number" step="0.01" name="price" placeholder="Price" required>
-        <input type="text" name="category" placeholder="Category" required>
-        <button type="submit">Add Item</button>
-      </form>
-      <pre id="responseBox">Response will appear here...</pre>
-    </div>
-
-    <div class="card">
-      <h3>Current Inventory</h3>
-      <table id="itemsTable">
-        <thead>
-          <tr><th>ID</th><th>Name</th><th>Price</th><th>Category</th></tr>
-        </thead>
-        <tbody></tbody>
-      </table>
-    </div>
-
-    <script>
-      async function loadItems(){
-        const res = await fetch('/items');
-        const data = await res.json();
-        const tbody = document.querySelector('#itemsTable tbody');
-        tbody.innerHTML = '';
-        data.forEach(item => {
-          const tr = document.createElement('tr');
-          tr.innerHTML = `<td>${item.id}</td><td>${item.name}</td><td>$${item.price.toFixed(2)}</td><td>${item.category}</td>`;
-          tbody.appendChild(tr);
-        });
-      }
-
-      async function submitForm(e){
-        e.preventDefault();
-        const form = e.target;
-        const data = Object.fromEntries(new FormData(form).entries());
-        data.price = parseFloat(data.price);
-        const res = await fetch('/items',{method:'POST',headers:{'Content-Type':'application/json'},body:JSON.stringify(data)});
-        const json = await res.json();
-        document.getElementById('responseBox').textContent = JSON.stringify(json,null,2);
-        form.reset();
-        loadItems();
-      }
-
-      window.onload = loadItems;
-    </script>
-  </body>
-</html>
-"""
+def _json_bytes(payload: bytes) -> Response:
+    # Handing Quart bytes lets it take Content-Length from len(payload)
+    # without buffering or re-encoding the body.
+    return Response(payload, mimetype="application/json")
+
 
-# -----------------------------
-# Flask Routes
-# -----------------------------
 @app.get("/")
-def index():
-    return render_template_string(INDEX_TEMPLATE)
+async def index():
+    return await app.send_static_file("index.html")
 
 
 @app.get("/items")
-def get_items():
-    return jsonify(items_to_dicts(inventory.all()))
+async def get_items():
+    return _json_bytes(inventory.to_json())
 
 
 @app.get("/items/expensive")
-def get_expensive():
+async def get_expensive():
     try:
         min_price = float(request.args.get("min", 100))
     except (TypeError, ValueError):
         min_price = 100.0
-    items = inventory.expensive(min_price)
-    return jsonify(items_to_dicts(items))
+    return _json_bytes(inventory.expensive_json(min_price))
 
 
 @app.get("/items/search")
-def search_items():
+async def search_items():
     min_price = request.args.get("min")
     category = request.args.get("category")
     min_price_f = float(min_price) if min_price is not None else None
-    filtered = filter_items(inventory.all(), min_price=min_price_f, category=category)
-    return jsonify(items_to_dicts(filtered))
+    return _json(inventory.search_dicts(min_price=min_price_f, category=category))
 
 
 @app.post("/items")
-def create_item():
-    data = request.get_json(force=True, silent=True) or request.form.to_dict()
-    name = data.get("name")
-    price = data.get("price")
-    category = data.get("category")
-    if not isinstance(name, str) or not category or not price:
-        return jsonify({"error": "Invalid payload. Expect name, price, category"}), 400
+async def create_item():
+    form = await request.form
     try:
-        price = float(price)
-    except Exception:
-        return jsonify({"error": "Price must be a number"}), 400
-    item = inventory.add(Item(name=name.strip(), price=price, category=category.strip()))
-    return jsonify(item.to_dict()), 201
+        if form:
+            payload = ItemIn.model_validate(form.to_dict())
+        else:
+            # Parse and validate the JSON body in one pass, skipping json.loads.
+            payload = ItemIn.model_validate_json(await request.get_data())
+    except ValidationError as e:
+        return _json({
+            "error": "Invalid payload. Expect name, price, category",
+            "details": e.errors(include_url=False, include_context=False, include_input=False),
+        }), 400
+    item = inventory.add(Item(**payload.model_dump()))
+    return _json(item.to_dict()), 201
 
 
 @app.get("/async/quotes")
 async def async_quotes():
-    results = await asyncio.gather(*(compute_adjusted_price(i) for i in inventory.all()))
-    return jsonify(results)
+    items = inventory.to_dicts()
+    ids, prices, cats_lower = inventory.columns()
+    # Tax only depends on the category, so fetch it once per distinct category.
+    cats, cat_idx = np.unique(cats_lower, return_inverse=True)
+    if FAST:
+        # Nothing to wait on, so skip scheduling coroutines altogether.
+        cat_rates = [static_tax_rate(c) for c in cats.tolist()]
+        discounts = [static_discount(i) for i in ids.tolist()]
+    else:
+        # One flat gather for every fetch; results come back in argument order.
+        fetched = await asyncio.gather(
+            *(fetch_tax_rate(c) for c in cats.tolist()),
+            *(fetch_dynamic_discount(i) for i in ids.tolist()),
+        )
+        cat_rates, discounts = fetched[: len(cats)], fetched[len(cats):]
+    tax_rates = np.asarray(cat_rates, dtype=np.float64)[cat_idx]
+    taxed, final = compute_adjusted_prices(prices, tax_rates, np.asarray(discounts, dtype=np.float64))
+    results = [
+        {
+            "item": item,
+            "tax_rate": tax_rate,
+            "discount_percent": discount_pct,
+            "taxed_price": taxed_price,
+            "final_price": final_price,
+        }
+        for item, tax_rate, discount_pct, taxed_price, final_price in zip(
+            items, tax_rates.tolist(), discounts, taxed.tolist(), final.tolist()
+        )
+    ]
+    return _json(results)
 
 
 if __name__ == "__main__":
-    import os
+    # Development server only; production goes through gunicorn.conf.py.
+    if os.environ.get("DEBUG") != "1":
+        raise SystemExit("Set DEBUG=1 for the development server, or run `gunicorn app:app`.")
     port = int(os.environ.get("PORT", 5000))
-    app.run(host="0.0.0.0", port=port)
+    app.run(host="0.0.0.0", port=port, debug=True, use_reloader=True)
 
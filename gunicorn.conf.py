@@ -0,0 +1,18 @@
+"""Gunicorn settings; picked up automatically when gunicorn starts in this directory."""
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+
+# Quart is an ASGI app, so run Uvicorn's event loop inside each Gunicorn
+# worker rather than the sync/gthread workers.
+worker_class = "uvicorn_worker.UvicornWorker"
+
+# The Inventory and its id allocator live in process memory, so a second
+# worker would neither see items POSTed to the first nor avoid reusing its
+# ids. Stay at one worker (its event loop already serves requests
+# concurrently) unless WEB_CONCURRENCY is set deliberately.
+workers = int(os.environ.get("WEB_CONCURRENCY", 1))
+
+# Import the app (seed inventory, Numba kernel) once in the master and let
+# workers share those pages copy-on-write.
+preload_app = True
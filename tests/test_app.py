@@ -0,0 +1,53 @@
+import asyncio
+import math
+
+import orjson
+import pytest
+
+import app
+from app import IdAllocator, Inventory, Item
+
+
+def test_explicit_ids_are_not_reallocated():
+    inv = Inventory([Item("a", 1.0, "x", id=10), Item("b", 2.0, "x")])
+    inv.add(Item("c", 3.0, "x", id=20))
+    inv.add(Item("d", 4.0, "x"))
+    inv.add(Item("e", 5.0, "x", id=5))
+    inv.add(Item("f", 6.0, "x"))
+    ids = [i.id for i in inv.all()]
+    assert ids == [10, 11, 20, 21, 5, 22]
+    assert len(set(ids)) == len(ids)
+
+
+def test_allocator_batches_are_consecutive():
+    ids = IdAllocator()
+    assert ids.allocate(3) == range(1, 4)
+    ids.reserve(10)
+    assert ids.allocate() == range(11, 12)
+
+
+@pytest.mark.parametrize("threshold", [math.nan, math.inf, -math.inf, 0.0, 24.5, 100.0])
+def test_expensive_matches_linear_scan(threshold):
+    prices = [9.99, 24.5, 3.25, 189.0, 399.99, 24.5, 0.0]
+    inv = Inventory(Item(f"n{k}", p, "x") for k, p in enumerate(prices))
+    expected = [i.id for i in inv.all() if i.price >= threshold]
+    assert [i.id for i in inv.expensive(threshold)] == expected
+    assert [d["id"] for d in orjson.loads(inv.expensive_json(threshold))] == expected
+
+
+def test_items_cache_invalidated_by_post(monkeypatch):
+    monkeypatch.setattr(app, "inventory", Inventory([Item("a", 1.0, "x")]))
+
+    async def run():
+        client = app.app.test_client()
+        before = await (await client.get("/items")).get_json()
+        resp = await client.post("/items", json={"name": "b", "price": 2.0, "category": "y"})
+        assert resp.status_code == 201
+        after = await (await client.get("/items")).get_json()
+        expensive = await (await client.get("/items/expensive?min=2")).get_json()
+        return before, after, expensive
+
+    before, after, expensive = asyncio.run(run())
+    assert [d["name"] for d in before] == ["a"]
+    assert [d["name"] for d in after] == ["a", "b"]
+    assert [d["name"] for d in expensive] == ["b"]